@@ -0,0 +1,3 @@
+"""Package version, kept in sync with `project.version` in pyproject.toml."""
+
+__version__ = "0.1.5"
@@ -16,41 +16,34 @@ ttree: a tree-like directory listing using rich + typer.
 from __future__ import annotations
 
 import os
-from collections import Counter
+import stat
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
-from importlib import metadata as _metadata
-from pathlib import Path
+from enum import Enum, auto
+from functools import lru_cache
+from operator import attrgetter
 from typing import Iterable
 
-try:
-    import tomllib
-except ModuleNotFoundError:  # pragma: no cover - Python < 3.11 fallback
-    tomllib = None  # type: ignore
-
 import typer
 from rich.console import Console
+from rich.text import Text
 from rich.theme import Theme
 from rich.tree import Tree
 
+from ._version import __version__
+
 __all__ = ["app"]
 
 app = typer.Typer(add_completion=False)
 
-_DIST_NAME = "tea-tree"
-
-try:
-    __version__ = _metadata.version(_DIST_NAME)
-except _metadata.PackageNotFoundError:  # pragma: no cover - local dev editable installs
-    if tomllib is not None:
-        try:
-            project_root = Path(__file__).resolve().parents[2]
-            pyproject = project_root / "pyproject.toml"
-            data = tomllib.loads(pyproject.read_text())
-            __version__ = data["project"]["version"]
-        except Exception:
-            __version__ = "0.0.0"
-    else:
-        __version__ = "0.0.0"
+# Directory scanning is syscall-bound, so oversubscribing the CPUs pays off on
+# slow or remote filesystems.
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
 
 theme = Theme(
     {
@@ -74,15 +67,128 @@ console = Console(theme=theme, no_color=_env_requests_no_color())
 
 
 def configure_console(disable_color: bool) -> None:
-    """Reinitialize the global console with the requested color setting."""
+    """
+    Reinitialize the global console with the requested color setting.
+
+    The console is only rebuilt when the setting actually changes, since
+    constructing one probes the terminal and environment.
+    """
     global console
+    if console.no_color == disable_color:
+        return
     console = Console(theme=theme, no_color=disable_color)
 
 
-@dataclass
+@dataclass(slots=True)
 class CrawlStats:
     directories: int = 0
     files: int = 0
+    # time.monotonic() of the last spinner update, used to throttle redraws.
+    last_update: float = 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    """A directory entry classified once, so later passes never re-stat it."""
+
+    name: str
+    path: str
+    kind: str  # "dir" or "file"
+    is_symlink: bool = False
+    inode: tuple[int, int] | None = None
+    target: str | None = None  # read only for listed symlinks; None if unreadable
+
+
+def _classify(entry: os.DirEntry) -> _Entry | None:
+    """
+    Classify `entry` as a directory or file using DirEntry's cached metadata.
+
+    Symlinks are followed to classify their target, keeping a directory
+    target's `(st_ino, st_dev)`. Returns None for special files.
+    """
+    name = entry.name
+    path = entry.path
+    try:
+        is_symlink = entry.is_symlink()
+    except OSError:
+        return _Entry(name, path, "file")
+
+    try:
+        if is_symlink:
+            st = entry.stat(follow_symlinks=True)
+            if stat.S_ISDIR(st.st_mode):
+                return _Entry(name, path, "dir", True, (st.st_ino, st.st_dev))
+            return _Entry(name, path, "file", True)
+        if entry.is_dir(follow_symlinks=False):
+            return _Entry(name, path, "dir")
+        if entry.is_file(follow_symlinks=False):
+            return _Entry(name, path, "file")
+    except OSError:
+        # Dangling symlinks and unreadable entries are shown as plain files.
+        return _Entry(name, path, "file", is_symlink)
+    return None
+
+
+def _dir_identity(path: str) -> tuple[int, int] | None:
+    """Return the `(st_ino, st_dev)` of the directory at `path`, or None."""
+    try:
+        st = os.stat(path, follow_symlinks=True)
+    except OSError:
+        return None
+    return st.st_ino, st.st_dev
+
+
+def _read_link(path: str, dir_fd: int | None = None) -> str | None:
+    """Return the target stored in the symlink at `path`, or None."""
+    try:
+        return os.readlink(path, dir_fd=dir_fd)
+    except OSError:
+        return None
+
+
+# Whether children can be stat'ed and readlink'ed relative to an open parent
+# directory fd.
+_HAVE_DIR_FD = (
+    os.stat in os.supports_dir_fd
+    and os.readlink in os.supports_dir_fd
+    and hasattr(os, "O_DIRECTORY")
+)
+
+
+def _resolve_listed(parent: str, dirs: list[_Entry], files: list[_Entry]) -> None:
+    """
+    Fill in the missing `(st_ino, st_dev)` of `dirs` and the target of each symlink.
+
+    Where supported, children are looked up by name relative to an fd for `parent`.
+    """
+    pending = [d for d in dirs if d.inode is None]
+    links = [e for e in dirs if e.is_symlink] + [e for e in files if e.is_symlink]
+    if not pending and not links:
+        return
+
+    if _HAVE_DIR_FD:
+        try:
+            parent_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            pass
+        else:
+            try:
+                for d in pending:
+                    try:
+                        st = os.stat(d.name, dir_fd=parent_fd)
+                    except OSError:
+                        continue
+                    d.inode = (st.st_ino, st.st_dev)
+                for link in links:
+                    link.target = _read_link(link.name, parent_fd)
+            finally:
+                os.close(parent_fd)
+            return
+
+    for d in pending:
+        d.inode = _dir_identity(d.path)
+    for link in links:
+        link.target = _read_link(link.path)
 
 
 def get_file_type(filename: str) -> str:
@@ -90,53 +196,83 @@ def get_file_type(filename: str) -> str:
     Returns the lowercase file extension (without leading dot),
     or 'no extension' if none found.
     """
-    p = Path(filename)
-    ext = p.suffix.lower()
-    if ext:
-        return ext[1:]  # without leading '.'
-    else:
-        return "no extension"
+    head, _, ext = filename.rpartition(".")
+    # Same rules as Path.suffix: a leading or trailing dot is not an extension.
+    if not head or not ext:
+        return _NO_EXTENSION
+    return _normalize_extension(ext)
+
+
+_NO_EXTENSION = sys.intern("no extension")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_extension(ext: str) -> str:
+    """Return `ext` lowercased and interned, so equal extensions share one string."""
+    return sys.intern(ext.lower())
+
+
+# A run of label text and the theme style it is shown in ("" for unstyled).
+_Segment = tuple[str, str]
 
 
-def summarize_types(files: Iterable[os.DirEntry]) -> str:
+def _type_summary(files: Iterable[_Entry]) -> list[_Segment]:
     """
-    Count types in files and produce a summary string with markup.
+    Count types in files and return the summary as styled segments.
 
-    - Unique extensions are listed by filename in `[file]` markup so they stay green.
-    - Shared extensions are grouped and wrapped in `[summary]` so they stay dim.
+    - Unique extensions are listed by filename in the `file` style.
+    - Shared extensions are grouped as `N ext` in the dim `summary` style.
     """
     file_entries = list(files)
     if not file_entries:
-        return "[summary]0 files[/summary]"
-
-    file_infos = [(entry.name, get_file_type(entry.name)) for entry in file_entries]
-    file_infos.sort(key=lambda info: info[0])
+        return [("0 files", "summary")]
+
+    groups: dict[str, list[str]] = defaultdict(list)
+    file_type = get_file_type
+    for entry in file_entries:
+        name = entry.name
+        groups[file_type(name)].append(name)
+
+    # Only the names listed individually need ordering.
+    singletons = sorted(names[0] for names in groups.values() if len(names) == 1)
+    grouped = sorted(
+        ((ext, len(names)) for ext, names in groups.items() if len(names) > 1),
+        key=lambda kv: (-kv[1], kv[0]),
+    )
 
-    counts = Counter(ftype for _, ftype in file_infos)
+    parts: list[_Segment] = [(name, "file") for name in singletons]
+    parts += [(f"{count} {ext}", "summary") for ext, count in grouped]
+    noun = "file" if len(file_entries) == 1 else "files"
 
-    singletons = [
-        f"[file]{name}[/file]" for name, ftype in file_infos if counts[ftype] == 1
-    ]
-    grouped = []
-    for ext, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        if count == 1:
-            continue
-        label = f"{ext}" if ext != "no extension" else "no extension"
-        grouped.append(f"[summary]{count} {label}[/summary]")
+    segments: list[_Segment] = []
+    for part in parts:
+        if segments:
+            segments.append((", ", ""))
+        segments.append(part)
+    if segments:
+        segments.append((" ", ""))
+    segments.append((noun, "summary"))
+    return segments
 
-    parts = singletons + grouped
-    noun = "file" if sum(counts.values()) == 1 else "files"
-    noun_markup = f"[summary]{noun}[/summary]"
-    if not parts:
-        return noun_markup
 
-    return f"{', '.join(parts)} {noun_markup}"
+# Minimum number of seconds between spinner text updates (at most 10 per second).
+STATUS_UPDATE_INTERVAL = 0.1
 
 
 def update_status(status, root_label: str, stats: CrawlStats) -> None:
-    """Update the spinner text with current directory/file counts."""
+    """
+    Update the spinner text with current directory/file counts.
+
+    Updates closer than STATUS_UPDATE_INTERVAL seconds to the previous one are
+    skipped, so fast scans don't spend their time re-rendering text while slow
+    scans still show steady progress.
+    """
     if status is None:
         return
+    now = time.monotonic()
+    if now - stats.last_update < STATUS_UPDATE_INTERVAL:
+        return
+    stats.last_update = now
     d = stats.directories
     f = stats.files
     d_noun = "directory" if d == 1 else "directories"
@@ -147,126 +283,330 @@ def update_status(status, root_label: str, stats: CrawlStats) -> None:
     )
 
 
-def build_tree(
-    path: Path,
-    tree: Tree,
+def _link_segments(target: str | None) -> list[_Segment]:
+    """Return the ` -> target` label segments for a symlink, `?` if unreadable."""
+    if target is None:
+        return [(" -> ", ""), ("?", "error")]
+    return [(f" -> {target}", "")]
+
+
+@dataclass(slots=True)
+class TreeNode:
+    """One line of the tree as plain data: styled label segments and child lines."""
+
+    segments: list[_Segment]
+    # Leaves (files and summaries) share the empty tuple instead of each
+    # allocating an empty list; directories are given a list to fill.
+    children: list[TreeNode] | tuple[()] = ()
+
+    @property
+    def label(self) -> str:
+        """The label as plain text, without styles."""
+        return "".join(text for text, _ in self.segments)
+
+
+_Listing = tuple[list[_Entry], list[_Entry]]
+_name = attrgetter("name")
+_ScanKey = tuple[int, int] | str
+
+
+def _scan_dir(
+    path: str, max_files_to_list: int, max_dirs_to_list: int, show_all: bool
+) -> _Listing | None:
+    """
+    Read one directory and return its (dirs, files).
+
+    Each list is sorted by name only when it will be listed individually;
+    collapsed lists are summarized, so their order does not matter.
+    Returns None when the directory cannot be read due to permissions.
+    """
+    dirs: list[_Entry] = []
+    files: list[_Entry] = []
+    add_dir = dirs.append
+    add_file = files.append
+    classify = _classify
+
+    # Entries are filtered and classified as they are read, without an
+    # intermediate list.
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not show_all and entry.name[0] == ".":
+                    continue
+                record = classify(entry)
+                if record is None:
+                    continue
+                if record.kind == "dir":
+                    add_dir(record)
+                else:
+                    add_file(record)
+    except PermissionError:
+        return None
+
+    list_dirs = len(dirs) <= max_dirs_to_list
+    list_files = len(files) <= max_files_to_list
+    if list_dirs:
+        dirs.sort(key=_name)
+    if list_files:
+        files.sort(key=_name)
+    # Collapsed entries are only counted, so they never cost a stat or readlink.
+    _resolve_listed(path, dirs if list_dirs else [], files if list_files else [])
+    return dirs, files
+
+
+class _Taken(Enum):
+    """Sentinel type for a directory whose listing was already taken."""
+
+    TAKEN = auto()
+
+
+_TAKEN = _Taken.TAKEN
+
+
+class _Scanner:
+    """
+    Read directories on a thread pool and hand out their listings on demand.
+
+    Each directory is scanned at most once, keyed by `(st_ino, st_dev)` or its
+    path. Without a pool, directories are read on the calling thread.
+    """
+
+    def __init__(
+        self,
+        pool: ThreadPoolExecutor | None,
+        max_files_to_list: int,
+        max_dirs_to_list: int,
+        show_all: bool,
+    ) -> None:
+        self.pool = pool
+        self.max_files_to_list = max_files_to_list
+        self.max_dirs_to_list = max_dirs_to_list
+        self.show_all = show_all
+        # A key maps to None once its listing has been taken, so finished
+        # listings are not held for the rest of the walk.
+        self.scans: dict[_ScanKey, Future[_Listing | None] | None] = {}
+        self.taken: set[_ScanKey] = set()
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def submit(self, path: str, key: _ScanKey) -> None:
+        """Queue `path` for scanning unless its directory is already queued."""
+        with self.lock:
+            if self.closed or key in self.scans:
+                return
+            future = self.pool.submit(
+                _scan_dir,
+                path,
+                self.max_files_to_list,
+                self.max_dirs_to_list,
+                self.show_all,
+            )
+            self.scans[key] = future
+        future.add_done_callback(self._queue_subdirs)
+
+    def take(self, path: str, key: _ScanKey) -> _Listing | _Taken | None:
+        """
+        Return the listing for the directory at `path`, waiting for its scan.
+
+        Only the first call for a key gets the listing (or None when it could not
+        be read); later calls return _TAKEN, which is how a directory reachable
+        via several paths is assembled once.
+        """
+        if key in self.taken:
+            return _TAKEN
+        self.taken.add(key)
+        if self.pool is None:
+            return _scan_dir(
+                path, self.max_files_to_list, self.max_dirs_to_list, self.show_all
+            )
+        self.submit(path, key)
+        future = self.scans[key]
+        self.scans[key] = None
+        return future.result()
+
+    def close(self) -> None:
+        """Stop queueing new scans and cancel those not yet started."""
+        with self.lock:
+            self.closed = True
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _queue_subdirs(self, future: Future[_Listing | None]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        listing = future.result()
+        if listing is None:
+            return
+        dirs, _ = listing
+        if len(dirs) > self.max_dirs_to_list:
+            return
+        for d in dirs:
+            self.submit(d.path, d.inode if d.inode is not None else d.path)
+
+
+def build_tree_labels(
+    path: str | os.PathLike[str],
     max_files_to_list: int,
     max_dirs_to_list: int,
     show_all: bool,
     stats: CrawlStats | None = None,
     status=None,
     root_label: str | None = None,
-    seen: set[tuple[int, int]] | None = None,
-) -> None:
+    jobs: int = DEFAULT_JOBS,
+) -> list[TreeNode]:
     """
-    Recursively build the tree for `path` into the given rich Tree node.
+    Return the lines under `path` as a TreeNode hierarchy.
 
-    If show_all is False, dotfiles (files or dirs starting with '.') are ignored.
+    Directories are scanned by up to `jobs` threads and assembled in depth-first,
+    name-sorted order. If show_all is False, dotfiles (files or dirs starting
+    with '.') are ignored.
     """
-    if seen is None:
-        seen = set()
-    try:
-        stat_result = os.stat(path, follow_symlinks=True)
-        seen.add((stat_result.st_ino, stat_result.st_dev))
-    except OSError:
-        pass
+    root = os.fspath(path)
+    root_inode = _dir_identity(root)
+    root_key: _ScanKey = root_inode if root_inode is not None else root
+    nodes: list[TreeNode] = []
+
+    # A single worker would only add hand-offs, so jobs=1 scans inline.
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext()
+    with executor as pool:
+        scanner = _Scanner(
+            pool,
+            max_files_to_list=max_files_to_list,
+            max_dirs_to_list=max_dirs_to_list,
+            show_all=show_all,
+        )
+        try:
+            stack: list[tuple[str, _ScanKey, list[TreeNode]]] = [(root, root_key, nodes)]
+            while stack:
+                dir_path, key, children = stack.pop()
+                add = children.append
 
-    try:
-        with os.scandir(path) as it:
-            if show_all:
-                entries = list(it)
+                listing = scanner.take(dir_path, key)
+                # Prevent infinite recursion when a directory is reachable via multiple paths.
+                if listing is _TAKEN:
+                    continue
+                if listing is None:
+                    add(TreeNode([("permission denied", "error")]))
+                    continue
+
+                dirs, files = listing
+
+                if stats is not None:
+                    stats.directories += len(dirs)
+                    stats.files += len(files)
+                    if status is not None and root_label is not None:
+                        update_status(status, root_label, stats)
+
+                num_dirs = len(dirs)
+                if num_dirs:
+                    if num_dirs <= max_dirs_to_list:
+                        pending: list[tuple[str, _ScanKey, list[TreeNode]]] = []
+                        for d in dirs:
+                            segments: list[_Segment] = [(d.name, "dir")]
+                            if d.is_symlink:
+                                segments += _link_segments(d.target)
+
+                            grandchildren: list[TreeNode] = []
+                            add(TreeNode(segments, grandchildren))
+                            child_key = d.inode if d.inode is not None else d.path
+                            pending.append((d.path, child_key, grandchildren))
+
+                        # Reversed so the first name-sorted directory is walked first.
+                        stack.extend(reversed(pending))
+                    else:
+                        noun = "directory" if num_dirs == 1 else "directories"
+                        add(TreeNode([(f"{num_dirs} {noun}", "summary")]))
+
+                num_files = len(files)
+                if not num_files:
+                    continue
+
+                if num_files <= max_files_to_list:
+                    for f in files:
+                        if f.is_symlink:
+                            add(TreeNode([(f.name, "file"), *_link_segments(f.target)]))
+                        else:
+                            add(TreeNode([(f.name, "file")]))
+                else:
+                    add(TreeNode(_type_summary(files)))
+        finally:
+            scanner.close()
+
+    return nodes
+
+
+def _render(nodes: list[TreeNode], tree: Tree) -> None:
+    """Add `nodes` and their descendants to the rich Tree `tree`."""
+    stack = [(nodes, tree)]
+    while stack:
+        children, parent = stack.pop()
+        for node in children:
+            segments = node.segments
+            if len(segments) == 1:
+                text, style = segments[0]
+                label = Text(text, style=style)
             else:
-                entries = [e for e in it if not e.name.startswith(".")]
-    except PermissionError:
-        tree.add("[error]permission denied[/error]")
-        return
+                label = Text.assemble(*segments)
+            branch = parent.add(label)
+            if node.children:
+                stack.append((node.children, branch))
 
-    dirs: list[os.DirEntry] = []
-    files: list[os.DirEntry] = []
 
-    for entry in entries:
-        try:
-            if entry.is_dir(follow_symlinks=True):
-                dirs.append(entry)
-                continue
-        except OSError:
-            pass
+def build_tree(
+    path: str | os.PathLike[str],
+    tree: Tree,
+    max_files_to_list: int,
+    max_dirs_to_list: int,
+    show_all: bool,
+    stats: CrawlStats | None = None,
+    status=None,
+    root_label: str | None = None,
+    jobs: int = DEFAULT_JOBS,
+) -> None:
+    """
+    Build the tree for `path` into the given rich Tree node.
 
-        try:
-            if entry.is_file(follow_symlinks=False) or entry.is_symlink():
-                files.append(entry)
-        except OSError:
-            files.append(entry)
-
-    dirs.sort(key=lambda e: e.name)
-    files.sort(key=lambda e: e.name)
-
-    if stats is not None:
-        stats.directories += len(dirs)
-        stats.files += len(files)
-        if status is not None and root_label is not None:
-            update_status(status, root_label, stats)
-
-    num_dirs = len(dirs)
-    if num_dirs:
-        if num_dirs <= max_dirs_to_list:
-            for d in dirs:
-                dir_label = f"[dir]{d.name}[/dir]"
-                if d.is_symlink():
-                    try:
-                        target = os.readlink(d.path)
-                        dir_label = f"{dir_label} -> {target}"
-                    except OSError:
-                        dir_label = f"{dir_label} -> [error]?[/error]"
+    See build_tree_labels for how the directory is walked.
+    """
+    nodes = build_tree_labels(
+        path,
+        max_files_to_list=max_files_to_list,
+        max_dirs_to_list=max_dirs_to_list,
+        show_all=show_all,
+        stats=stats,
+        status=status,
+        root_label=root_label,
+        jobs=jobs,
+    )
+    _render(nodes, tree)
 
-                branch = tree.add(dir_label)
 
-                inode: tuple[int, int] | None = None
-                try:
-                    stat_result = os.stat(d.path, follow_symlinks=True)
-                    inode = (stat_result.st_ino, stat_result.st_dev)
-                except OSError:
-                    pass
+def _print_version(no_color: bool) -> None:
+    """Print the version, honoring --no-color and NO_COLOR, and exit."""
+    configure_console(no_color or _env_requests_no_color())
+    console.print(__version__)
+    raise typer.Exit()
 
-                # Prevent infinite recursion when a directory is reachable via multiple paths.
-                if inode is not None and inode in seen:
-                    continue
 
-                if inode is not None:
-                    seen.add(inode)
-
-                build_tree(
-                    Path(d.path),
-                    branch,
-                    max_files_to_list=max_files_to_list,
-                    max_dirs_to_list=max_dirs_to_list,
-                    show_all=show_all,
-                    stats=stats,
-                    status=status,
-                    root_label=root_label,
-                    seen=seen,
-                )
-        else:
-            noun = "directory" if num_dirs == 1 else "directories"
-            tree.add(f"[summary]{num_dirs} {noun}[/summary]")
+def _no_color_callback(ctx: typer.Context, value: bool) -> bool:
+    """Print a version requested by an earlier -V, now that --no-color is known."""
+    if ctx.meta.get("ttree.version"):
+        _print_version(value)
+    return value
 
-    num_files = len(files)
-    if not num_files:
-        return
 
-    if num_files <= max_files_to_list:
-        for f in files:
-            if f.is_symlink():
-                try:
-                    target = os.readlink(f.path)
-                    tree.add(f"[file]{f.name}[/file] -> {target}")
-                except OSError:
-                    tree.add(f"[file]{f.name}[/file] -> [error]?[/error]")
-            else:
-                tree.add(f"[file]{f.name}[/file]")
-    else:
-        summary = summarize_types(files)
-        tree.add(summary)
+def _version_callback(ctx: typer.Context, value: bool) -> None:
+    """
+    Print the version and exit as soon as -V/--version and --no-color are parsed.
+
+    Click runs eager options in command-line order, so for `-V --no-color`
+    the version is printed from the --no-color callback instead.
+    """
+    if not value:
+        return
+    if "no_color" in ctx.params:
+        _print_version(ctx.params["no_color"])
+    ctx.meta["ttree.version"] = True
 
 
 @app.command()
@@ -297,6 +637,18 @@ def main(
             "instead of listing them. Default: 20"
         ),
     ),
+    jobs: int = typer.Option(
+        DEFAULT_JOBS,
+        "-j",
+        "--jobs",
+        min=1,
+        help=(
+            "Number of threads used to scan directories concurrently. "
+            "Raise it for slow network or cloud-mounted filesystems. "
+            "Default: min(32, 4 x CPU count)"
+        ),
+        show_default=False,
+    ),
     show_all: bool = typer.Option(
         False,
         "-a",
@@ -307,29 +659,30 @@ def main(
         False,
         "--no-color",
         help="Disable colored output (same as setting NO_COLOR=1).",
+        # Eager so that -V can honor it in either order.
+        callback=_no_color_callback,
+        is_eager=True,
     ),
     version: bool = typer.Option(
         False,
         "-V",
         "--version",
         help="Show ttree version and exit.",
+        callback=_version_callback,
         is_eager=True,
     ),
 ) -> None:
     disable_color = no_color or _env_requests_no_color()
     configure_console(disable_color)
 
-    if version:
-        console.print(__version__)
-        raise typer.Exit()
-
-    root_path = Path(directory)
+    # An empty argument means the current directory, as it did with pathlib.
+    root_path = directory or "."
 
-    if not root_path.exists():
+    if not os.path.exists(root_path):
         console.print(f"[error]Path does not exist:[/error] {directory}")
         raise typer.Exit(code=1)
 
-    if not root_path.is_dir():
+    if not os.path.isdir(root_path):
         console.print(f"[error]Not a directory:[/error] {directory}")
         raise typer.Exit(code=1)
 
@@ -338,7 +691,7 @@ def main(
     else:
         display_root = directory.rstrip("/")
 
-    root_tree = Tree(f"[dir]{display_root}[/dir]")
+    root_tree = Tree(Text(display_root, style="dir"))
     stats = CrawlStats()
 
     use_spinner = console.is_terminal
@@ -356,6 +709,7 @@ def main(
                 stats=stats,
                 status=status,
                 root_label=display_root,
+                jobs=jobs,
             )
     else:
         build_tree(
@@ -367,6 +721,7 @@ def main(
             stats=stats,
             status=None,
             root_label=display_root,
+            jobs=jobs,
         )
 
     console.print(root_tree)
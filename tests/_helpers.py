@@ -0,0 +1,15 @@
+"""Label helpers shared by the test modules."""
+
+from __future__ import annotations
+
+from rich.tree import Tree
+
+
+def label_text(node: Tree) -> str:
+    """Return the plain text of a node's label, as built by build_tree."""
+    return node.label.plain
+
+
+def child_labels(tree: Tree) -> list[str]:
+    """Return the plain labels of the direct children of `tree`."""
+    return [label_text(child) for child in tree.children]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from rich.tree import Tree
+
+# Shared directory layouts are built once per session; tests using them must
+# treat them as read-only.
+
+
+@pytest.fixture(scope="session")
+def dir_with_three_subdirs(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("three_subdirs")
+    base = str(root)
+    mkdir = os.mkdir
+    join = os.path.join
+    for name in ("alpha", "beta", "gamma"):
+        mkdir(join(base, name))
+    return root
+
+
+@pytest.fixture(scope="session")
+def dir_with_hidden_file(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("hidden_file")
+    (root / ".hidden.txt").write_text("secret")
+    return root
+
+
+@pytest.fixture(scope="session")
+def symlink_file_tree(tmp_path_factory) -> tuple[Path, Path]:
+    """Return (root, real file) for a root holding real.txt and link.txt -> real.txt."""
+    root = tmp_path_factory.mktemp("symlink_file")
+    real_file = root / "real.txt"
+    real_file.write_text("content")
+    os.symlink(real_file, root / "link.txt")
+    return root, real_file
+
+
+@pytest.fixture(scope="session")
+def symlink_dir_tree(tmp_path_factory) -> tuple[Path, Path]:
+    """Return (root, real dir) for a root holding real/inner.txt and link -> real."""
+    root = tmp_path_factory.mktemp("symlink_dir")
+    real_dir = root / "real"
+    os.makedirs(real_dir)
+    (real_dir / "inner.txt").write_text("data")
+    os.symlink(real_dir, root / "link")
+    return root, real_dir
+
+
+@pytest.fixture(scope="session")
+def runner():
+    """Typer CliRunner, imported only by tests that go through the CLI."""
+    from typer.testing import CliRunner
+
+    return CliRunner()
+
+
+@pytest.fixture
+def tree_factory() -> Callable[[], Tree]:
+    """Return a factory for fresh root Tree nodes."""
+
+    def make() -> Tree:
+        return Tree("[dir].[/dir]")
+
+    return make
@@ -1,28 +1,24 @@
 from __future__ import annotations
 
+import os
+import threading
+import tomllib
 from pathlib import Path
 from types import SimpleNamespace
 
-from rich.text import Text
-from rich.tree import Tree
-from typer.testing import CliRunner
+import pytest
+import typer
 
+from _helpers import child_labels
 import ttree.cli as cli_module
 from ttree import __version__
-from ttree.cli import app, build_tree, configure_console, get_file_type, summarize_types
-
-runner = CliRunner()
-
-
-def _labels(tree: Tree) -> list[str]:
-    labels = []
-    for child in tree.children:
-        label = child.label
-        if hasattr(label, "plain"):
-            labels.append(label.plain)
-        else:
-            labels.append(Text.from_markup(str(label)).plain)
-    return labels
+from ttree.cli import (
+    app,
+    build_tree,
+    build_tree_labels,
+    configure_console,
+    get_file_type,
+)
 
 
 def test_env_requests_no_color_handles_env(monkeypatch) -> None:
@@ -41,14 +37,32 @@ def test_configure_console_toggles_color() -> None:
     assert cli_module.console.no_color is False
 
 
-def test_cli_no_color_option_disables_colors() -> None:
+def test_configure_console_keeps_matching_console() -> None:
+    configure_console(False)
+    current = cli_module.console
+    configure_console(False)
+    assert cli_module.console is current
+
+
+@pytest.mark.slow
+def test_cli_no_color_option_disables_colors(runner) -> None:
     result = runner.invoke(app, ["--no-color", "-V"])
     assert result.exit_code == 0
     assert cli_module.console.no_color is True
     configure_console(False)
 
 
-def test_cli_respects_no_color_env(monkeypatch) -> None:
+@pytest.mark.slow
+def test_cli_no_color_option_after_version_disables_colors(runner) -> None:
+    result = runner.invoke(app, ["-V", "--no-color"])
+    assert result.exit_code == 0
+    assert result.stdout.strip() == __version__
+    assert cli_module.console.no_color is True
+    configure_console(False)
+
+
+@pytest.mark.slow
+def test_cli_respects_no_color_env(monkeypatch, runner) -> None:
     monkeypatch.setenv("NO_COLOR", "1")
     result = runner.invoke(app, ["-V"])
     assert result.exit_code == 0
@@ -61,43 +75,171 @@ def test_get_file_type_handles_extensions_and_missing() -> None:
     assert get_file_type("notes.md") == "md"
     assert get_file_type("archive.tar.gz") == "gz"
     assert get_file_type("LICENSE") == "no extension"
+    assert get_file_type(".bashrc") == "no extension"
+    assert get_file_type("trailing.") == "no extension"
 
 
-def test_summarize_types_lists_unique_types_before_group_counts() -> None:
+def test_get_file_type_reuses_normalized_extensions() -> None:
+    cli_module._normalize_extension.cache_clear()
+    first = get_file_type("a.PY")
+    assert get_file_type("b.PY") is first
+    assert get_file_type("c.py") is first
+    assert cli_module._normalize_extension.cache_info().hits == 1
+
+
+def test_type_summary_lists_unique_types_before_group_counts() -> None:
     files = [
         SimpleNamespace(name="a.py"),
         SimpleNamespace(name="b.PY"),
         SimpleNamespace(name="c.txt"),
         SimpleNamespace(name="README"),
     ]
-    assert (
-        summarize_types(files)
-        == "[file]README[/file], [file]c.txt[/file], [summary]2 py[/summary] [summary]files[/summary]"
+    assert cli_module._type_summary(files) == [
+        ("README", "file"),
+        (", ", ""),
+        ("c.txt", "file"),
+        (", ", ""),
+        ("2 py", "summary"),
+        (" ", ""),
+        ("files", "summary"),
+    ]
+
+
+def test_update_status_throttles_spinner_updates(monkeypatch) -> None:
+    updates: list[str] = []
+    status = SimpleNamespace(update=updates.append)
+    stats = cli_module.CrawlStats(directories=1, files=2)
+    clock = iter([100.0, 100.05, 100.2])
+    monkeypatch.setattr(cli_module.time, "monotonic", lambda: next(clock))
+
+    cli_module.update_status(status, ".", stats)
+    assert updates == ["[summary]Scanning .... (1 directory, 2 files)[/summary]"]
+
+    stats.files = 3
+    cli_module.update_status(status, ".", stats)
+    assert len(updates) == 1
+
+    cli_module.update_status(status, ".", stats)
+    assert len(updates) == 2
+    assert "(1 directory, 3 files)" in updates[1]
+
+
+def test_build_tree_counts_scanned_entries(tmp_path, tree_factory) -> None:
+    (tmp_path / "alpha").mkdir()
+    (tmp_path / "alpha" / "one.txt").write_text("")
+    (tmp_path / "beta").mkdir()
+    (tmp_path / "top.py").write_text("")
+
+    stats = cli_module.CrawlStats()
+    build_tree(
+        tmp_path,
+        tree_factory(),
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+        stats=stats,
     )
 
+    assert (stats.directories, stats.files) == (2, 2)
+
 
-def test_build_tree_summarizes_directory_counts(tmp_path) -> None:
-    for name in ("alpha", "beta", "gamma"):
-        (tmp_path / name).mkdir()
+class _FakeDirEntry:
+    """DirEntry stand-in that fails if classification asks for a stat."""
 
-    tree = Tree("[dir].[/dir]")
+    def __init__(self, name: str, kind: str) -> None:
+        self.name = name
+        self.path = f"/fake/{name}"
+        self.kind = kind
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self.kind == "dir"
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        return self.kind == "file"
+
+    def stat(self, *, follow_symlinks: bool = True):
+        raise AssertionError("plain entries must be classified without stat()")
+
+
+def test_classify_plain_entries_without_stat() -> None:
+    directory = cli_module._classify(_FakeDirEntry("src", "dir"))
+    regular = cli_module._classify(_FakeDirEntry("README.md", "file"))
+    fifo = cli_module._classify(_FakeDirEntry("pipe", "fifo"))
+
+    assert (directory.kind, directory.is_symlink, directory.inode) == ("dir", False, None)
+    assert (regular.kind, regular.path) == ("file", "/fake/README.md")
+    assert fifo is None
+
+
+def test_build_tree_summarizes_directory_counts(dir_with_three_subdirs) -> None:
+    nodes = build_tree_labels(
+        dir_with_three_subdirs,
+        max_files_to_list=5,
+        max_dirs_to_list=2,
+        show_all=False,
+    )
+
+    assert [node.label for node in nodes] == ["3 directories"]
+    assert nodes[0].segments == [("3 directories", "summary")]
+    assert nodes[0].children == ()
+
+
+def test_build_tree_renders_styled_segments(tmp_path, tree_factory) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "target.txt").write_text("")
+    os.symlink(tmp_path / "target.txt", tmp_path / "link.txt")
+
+    tree = tree_factory()
     build_tree(
         tmp_path,
         tree,
         max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    pkg, link, target = (child.label for child in tree.children)
+    assert (pkg.plain, str(pkg.style)) == ("pkg", "dir")
+    assert link.plain == f"link.txt -> {tmp_path / 'target.txt'}"
+    # Only the name is styled; the symlink target is plain text.
+    assert [(span.start, span.end, span.style) for span in link.spans] == [(0, 8, "file")]
+    assert (target.plain, str(target.style)) == ("target.txt", "file")
+
+
+def test_build_tree_does_not_stat_collapsed_directories(
+    monkeypatch, dir_with_three_subdirs, tree_factory
+) -> None:
+    real_stat = cli_module.os.stat
+    stat_calls: list[str] = []
+
+    def fake_stat(path, *args, **kwargs):
+        stat_calls.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(cli_module.os, "stat", fake_stat)
+
+    tree = tree_factory()
+    build_tree(
+        dir_with_three_subdirs,
+        tree,
+        max_files_to_list=5,
         max_dirs_to_list=2,
         show_all=False,
     )
 
-    assert _labels(tree) == ["3 directories"]
+    assert child_labels(tree) == ["3 directories"]
+    assert stat_calls == [str(dir_with_three_subdirs)]
 
 
-def test_build_tree_summarizes_files_when_limit_exceeded(tmp_path) -> None:
+def test_build_tree_summarizes_files_when_limit_exceeded(tmp_path, tree_factory) -> None:
     (tmp_path / "alpha.py").write_text("")
     (tmp_path / "beta.PY").write_text("")
     (tmp_path / "README").write_text("")
 
-    tree = Tree("[dir].[/dir]")
+    tree = tree_factory()
     build_tree(
         tmp_path,
         tree,
@@ -106,29 +248,44 @@ def test_build_tree_summarizes_files_when_limit_exceeded(tmp_path) -> None:
         show_all=True,
     )
 
-    assert _labels(tree) == ["README, 2 py files"]
+    assert child_labels(tree) == ["README, 2 py files"]
 
 
-def test_summarize_types_includes_filenames_for_single_extension_groups() -> None:
+def test_type_summary_orders_by_frequency_then_name() -> None:
+    files = [
+        SimpleNamespace(name=name)
+        for name in ("a.txt", "b.TXT", "c.md", "d.md", "e.md", "LICENSE", ".env", "f.rs", "z.toml")
+    ]
+    segments = cli_module._type_summary(files)
+    assert [text for text, style in segments if style] == [
+        "f.rs",
+        "z.toml",
+        "3 md",
+        "2 no extension",
+        "2 txt",
+        "files",
+    ]
+
+
+def test_type_summary_includes_filenames_for_single_extension_groups() -> None:
     entries = [
         SimpleNamespace(name="report.log"),
         SimpleNamespace(name="notes.md"),
         SimpleNamespace(name="image.JPG"),
         SimpleNamespace(name="script.sh"),
     ]
-    expected = (
-        "[file]image.JPG[/file], "
-        "[file]notes.md[/file], "
-        "[file]report.log[/file], "
-        "[file]script.sh[/file] [summary]files[/summary]"
+    segments = cli_module._type_summary(entries)
+    assert "".join(text for text, _ in segments) == (
+        "image.JPG, notes.md, report.log, script.sh files"
     )
-    assert summarize_types(entries) == expected
+    assert [style for _, style in segments if style] == ["file"] * 4 + ["summary"]
 
 
-def test_build_tree_honors_show_all_flag(tmp_path) -> None:
-    (tmp_path / ".hidden.txt").write_text("secret")
+def test_build_tree_keeps_brackets_in_names_literal(tmp_path, tree_factory) -> None:
+    (tmp_path / "[bold]dir").mkdir()
+    (tmp_path / "[red]notes.txt").write_text("")
 
-    tree = Tree("[dir].[/dir]")
+    tree = tree_factory()
     build_tree(
         tmp_path,
         tree,
@@ -136,20 +293,33 @@ def test_build_tree_honors_show_all_flag(tmp_path) -> None:
         max_dirs_to_list=5,
         show_all=False,
     )
-    assert _labels(tree) == []
 
-    tree = Tree("[dir].[/dir]")
+    assert child_labels(tree) == ["[bold]dir", "[red]notes.txt"]
+
+
+def test_build_tree_honors_show_all_flag(dir_with_hidden_file, tree_factory) -> None:
+    tree = tree_factory()
     build_tree(
-        tmp_path,
+        dir_with_hidden_file,
+        tree,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+    assert child_labels(tree) == []
+
+    tree = tree_factory()
+    build_tree(
+        dir_with_hidden_file,
         tree,
         max_files_to_list=5,
         max_dirs_to_list=5,
         show_all=True,
     )
-    assert _labels(tree) == [".hidden.txt"]
+    assert child_labels(tree) == [".hidden.txt"]
 
 
-def test_build_tree_handles_permission_error(monkeypatch, tmp_path) -> None:
+def test_build_tree_handles_permission_error(monkeypatch, tmp_path, tree_factory) -> None:
     real_scandir = cli_module.os.scandir
 
     def fake_scandir(path):
@@ -159,7 +329,7 @@ def test_build_tree_handles_permission_error(monkeypatch, tmp_path) -> None:
 
     monkeypatch.setattr(cli_module.os, "scandir", fake_scandir)
 
-    tree = Tree("[dir].[/dir]")
+    tree = tree_factory()
     build_tree(
         tmp_path,
         tree,
@@ -168,17 +338,179 @@ def test_build_tree_handles_permission_error(monkeypatch, tmp_path) -> None:
         show_all=True,
     )
 
-    assert _labels(tree) == ["permission denied"]
+    assert child_labels(tree) == ["permission denied"]
+
+
+def test_version_callback_prints_version(capsys) -> None:
+    ctx = SimpleNamespace(params={"no_color": False}, meta={})
+    with pytest.raises(typer.Exit):
+        cli_module._version_callback(ctx, True)
+    assert __version__ in capsys.readouterr().out
+
+
+def test_version_callback_waits_for_no_color(capsys) -> None:
+    ctx = SimpleNamespace(params={}, meta={})
+    cli_module._version_callback(ctx, True)
+    assert capsys.readouterr().out == ""
+
+    with pytest.raises(typer.Exit):
+        cli_module._no_color_callback(ctx, True)
+    assert __version__ in capsys.readouterr().out
+    assert cli_module.console.no_color is True
+    configure_console(False)
+
+
+def test_version_callback_ignores_unset_flag(capsys) -> None:
+    cli_module._version_callback(SimpleNamespace(params={}, meta={}), False)
+    assert capsys.readouterr().out == ""
 
 
-def test_version_flag() -> None:
+@pytest.mark.slow
+def test_version_flag(runner) -> None:
     result = runner.invoke(app, ["-V"])
     assert result.exit_code == 0
     assert __version__ in result.stdout.strip()
 
 
-def test_cli_errors_on_missing_path(tmp_path) -> None:
+def test_version_matches_pyproject() -> None:
+    pyproject = Path(__file__).resolve().parents[1] / "pyproject.toml"
+    data = tomllib.loads(pyproject.read_text())
+    assert __version__ == data["project"]["version"]
+
+
+@pytest.mark.slow
+def test_cli_errors_on_missing_path(tmp_path, runner) -> None:
     missing = tmp_path / "does-not-exist"
     result = runner.invoke(app, [str(missing)])
     assert result.exit_code == 1
     assert "Path does not exist" in result.stdout
+
+
+def test_build_tree_output_is_independent_of_jobs(tmp_path, tree_factory) -> None:
+    base = str(tmp_path)
+    join = os.path.join
+    for parent in ("alpha", "beta", "gamma"):
+        for child in ("one", "two"):
+            child_dir = join(base, parent, child)
+            os.makedirs(child_dir)
+            open(join(child_dir, f"{parent}.txt"), "w").close()
+
+    def render(jobs: int) -> list[list[str]]:
+        tree = tree_factory()
+        build_tree(
+            tmp_path,
+            tree,
+            max_files_to_list=5,
+            max_dirs_to_list=5,
+            show_all=False,
+            jobs=jobs,
+        )
+        return [child_labels(branch) for branch in tree.children]
+
+    assert render(1) == render(8) == [["one", "two"]] * 3
+
+
+def test_build_tree_with_one_job_scans_on_calling_thread(monkeypatch, tmp_path) -> None:
+    (tmp_path / "alpha" / "inner").mkdir(parents=True)
+    threads = set()
+    scan_dir = cli_module._scan_dir
+
+    def recording_scan_dir(*args, **kwargs):
+        threads.add(threading.get_ident())
+        return scan_dir(*args, **kwargs)
+
+    monkeypatch.setattr(cli_module, "_scan_dir", recording_scan_dir)
+
+    nodes = build_tree_labels(
+        tmp_path,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+        jobs=1,
+    )
+
+    assert [node.label for node in nodes] == ["alpha"]
+    assert threads == {threading.get_ident()}
+
+
+def test_build_tree_cancels_queued_scans_on_error(monkeypatch, tmp_path) -> None:
+    for index in range(10):
+        (tmp_path / f"sub{index}").mkdir()
+    root = str(tmp_path)
+    scanned: list[str] = []
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    scan_dir = cli_module._scan_dir
+    close = cli_module._Scanner.close
+
+    def blocking_scan_dir(path, *args, **kwargs):
+        scanned.append(path)
+        if path != root:
+            # Hold every worker on its first subdirectory until the walk is closed.
+            started.release()
+            release.wait(timeout=5)
+        return scan_dir(path, *args, **kwargs)
+
+    def failing_update_status(*args, **kwargs):
+        # Fail once both workers are busy and the other subdirectories are queued.
+        assert started.acquire(timeout=5) and started.acquire(timeout=5)
+        raise KeyboardInterrupt
+
+    def close_then_release(self) -> None:
+        close(self)
+        release.set()
+
+    monkeypatch.setattr(cli_module, "_scan_dir", blocking_scan_dir)
+    monkeypatch.setattr(cli_module, "update_status", failing_update_status)
+    monkeypatch.setattr(cli_module._Scanner, "close", close_then_release)
+
+    with pytest.raises(KeyboardInterrupt):
+        build_tree_labels(
+            tmp_path,
+            max_files_to_list=5,
+            max_dirs_to_list=20,
+            show_all=False,
+            stats=cli_module.CrawlStats(),
+            status=SimpleNamespace(update=lambda *args, **kwargs: None),
+            root_label=".",
+            jobs=2,
+        )
+
+    # The root plus the one scan each worker had started; the queued rest never ran.
+    assert len(scanned) == 3
+
+
+def test_build_tree_without_dir_fd_support(monkeypatch, tmp_path, tree_factory) -> None:
+    (tmp_path / "alpha" / "inner").mkdir(parents=True)
+    (tmp_path / "beta").mkdir()
+    os.symlink("alpha", tmp_path / "gamma")
+    monkeypatch.setattr(cli_module, "_HAVE_DIR_FD", False)
+
+    tree = tree_factory()
+    build_tree(
+        tmp_path,
+        tree,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    assert child_labels(tree) == ["alpha", "beta", "gamma -> alpha"]
+    assert child_labels(tree.children[0]) == ["inner"]
+
+
+@pytest.mark.slow
+def test_cli_accepts_jobs_option(tmp_path, runner) -> None:
+    (tmp_path / "sub").mkdir()
+    result = runner.invoke(app, [str(tmp_path), "-j", "2"])
+    assert result.exit_code == 0
+    assert "sub" in result.stdout
+
+
+@pytest.mark.slow
+def test_cli_errors_on_file_path(tmp_path, runner) -> None:
+    target = tmp_path / "file.txt"
+    target.write_text("")
+    result = runner.invoke(app, [str(target)])
+    assert result.exit_code == 1
+    assert "Not a directory" in result.stdout
@@ -1,37 +1,16 @@
 
 import os
 
-from rich.text import Text
-from rich.tree import Tree
+from _helpers import child_labels, label_text
+import ttree.cli as cli_module
+from ttree.cli import build_tree, build_tree_labels
 
-from ttree.cli import build_tree
 
+def test_build_tree_shows_symlinks_and_targets(symlink_file_tree) -> None:
+    root, real_file = symlink_file_tree
 
-def _label_text(node: Tree) -> str:
-    label = node.label
-    if hasattr(label, "plain"):
-        return label.plain
-    return Text.from_markup(str(label)).plain
-
-
-def _labels(tree: Tree) -> list[str]:
-    labels = []
-    for child in tree.children:
-        labels.append(_label_text(child))
-    return labels
-
-
-def test_build_tree_shows_symlinks_and_targets(tmp_path) -> None:
-    real_file = tmp_path / "real.txt"
-    real_file.write_text("content")
-    
-    link_file = tmp_path / "link.txt"
-    os.symlink(real_file, link_file)
-    
-    tree = Tree("[dir].[/dir]")
-    build_tree(
-        tmp_path,
-        tree,
+    nodes = build_tree_labels(
+        root,
         max_files_to_list=5,
         max_dirs_to_list=5,
         show_all=False,
@@ -43,7 +22,7 @@ def test_build_tree_shows_symlinks_and_targets(tmp_path) -> None:
     # In this test we passed an absolute path to os.symlink (real_file is absolute).
     # So we expect "link.txt -> /path/to/real.txt"
     
-    labels = _labels(tree)
+    labels = [node.label for node in nodes]
     assert len(labels) == 2
     assert "real.txt" in labels
     
@@ -52,15 +31,126 @@ def test_build_tree_shows_symlinks_and_targets(tmp_path) -> None:
     assert f"link.txt -> {real_file}" == link_label
 
 
-def test_build_tree_follows_directory_symlink(tmp_path) -> None:
+def test_build_tree_follows_directory_symlink(symlink_dir_tree) -> None:
+    root, real_dir = symlink_dir_tree
+
+    nodes = build_tree_labels(
+        root,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    labels = [node.label for node in nodes]
+    assert any(label.startswith("link") for label in labels)
+
+    link_node = next(node for node in nodes if node.label.startswith("link"))
+    assert link_node.label.startswith(f"link -> {real_dir}")
+    assert "inner.txt" in [child.label for child in link_node.children]
+
+
+def test_build_tree_lists_dangling_symlink_as_file(tmp_path, tree_factory) -> None:
+    os.symlink(tmp_path / "missing", tmp_path / "broken")
+
+    tree = tree_factory()
+    build_tree(
+        tmp_path,
+        tree,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    assert child_labels(tree) == [f"broken -> {tmp_path / 'missing'}"]
+
+
+def test_build_tree_stops_at_symlink_cycle(tmp_path, tree_factory) -> None:
+    inner = tmp_path / "inner"
+    inner.mkdir()
+    os.symlink(tmp_path, inner / "loop")
+
+    tree = tree_factory()
+    build_tree(
+        tmp_path,
+        tree,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    inner_branch = tree.children[0]
+    assert child_labels(inner_branch) == [f"loop -> {tmp_path}"]
+    assert inner_branch.children[0].children == []
+
+
+def test_build_tree_skips_readlink_for_collapsed_entries(
+    monkeypatch, tmp_path, tree_factory
+) -> None:
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    for name in ("a.txt", "b.txt"):
+        os.symlink(real_dir, tmp_path / f"dir-{name}")
+        (real_dir / name).write_text("")
+        os.symlink(real_dir / name, tmp_path / name)
+
+    def fail_readlink(path, *args, **kwargs):
+        raise AssertionError(f"unexpected readlink of {path}")
+
+    monkeypatch.setattr(cli_module.os, "readlink", fail_readlink)
+
+    tree = tree_factory()
+    build_tree(
+        tmp_path,
+        tree,
+        max_files_to_list=1,
+        max_dirs_to_list=1,
+        show_all=False,
+    )
+
+    assert child_labels(tree) == ["3 directories", "2 txt files"]
+
+
+def test_build_tree_follows_symlinks_without_canonicalizing(
+    monkeypatch, symlink_dir_tree, tree_factory
+) -> None:
+    root, real_dir = symlink_dir_tree
+
+    def fail_realpath(path, *args, **kwargs):
+        raise AssertionError(f"unexpected realpath of {path}")
+
+    monkeypatch.setattr(cli_module.os.path, "realpath", fail_realpath)
+
+    tree = tree_factory()
+    build_tree(
+        root,
+        tree,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    link_branch = tree.children[0]
+    assert label_text(link_branch) == f"link -> {real_dir}"
+    assert child_labels(link_branch) == ["inner.txt"]
+
+
+def test_build_tree_walks_shared_directory_once(monkeypatch, tmp_path, tree_factory) -> None:
     real_dir = tmp_path / "real"
     real_dir.mkdir()
     (real_dir / "inner.txt").write_text("data")
+    os.symlink(real_dir, tmp_path / "a")
+    os.symlink(real_dir, tmp_path / "b")
 
-    link_dir = tmp_path / "link"
-    os.symlink(real_dir, link_dir)
+    real_scandir = cli_module.os.scandir
+    scanned: list[str] = []
 
-    tree = Tree("[dir].[/dir]")
+    def counting_scandir(path):
+        scanned.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(cli_module.os, "scandir", counting_scandir)
+
+    tree = tree_factory()
     build_tree(
         tmp_path,
         tree,
@@ -69,9 +159,66 @@ def test_build_tree_follows_directory_symlink(tmp_path) -> None:
         show_all=False,
     )
 
-    labels = _labels(tree)
-    assert any(label.startswith("link") for label in labels)
+    assert child_labels(tree) == [f"a -> {real_dir}", f"b -> {real_dir}", "real"]
+    assert [child_labels(branch) for branch in tree.children] == [["inner.txt"], [], []]
+    assert len(scanned) == 2
+
+
+def test_build_tree_skips_readlink_for_hidden_symlinks(monkeypatch, tmp_path) -> None:
+    os.symlink(tmp_path / "missing", tmp_path / ".hidden-link")
+
+    def fail_readlink(path, *args, **kwargs):
+        raise AssertionError(f"unexpected readlink of {path}")
+
+    monkeypatch.setattr(cli_module.os, "readlink", fail_readlink)
+
+    nodes = build_tree_labels(
+        tmp_path,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    assert nodes == []
+
+
+def test_build_tree_reads_link_targets_relative_to_parent(
+    monkeypatch, symlink_file_tree
+) -> None:
+    root, real_file = symlink_file_tree
+    calls = []
+    readlink = os.readlink
+
+    def recording_readlink(path, *args, dir_fd=None):
+        calls.append((path, dir_fd is not None))
+        return readlink(path, *args, dir_fd=dir_fd)
+
+    monkeypatch.setattr(cli_module.os, "readlink", recording_readlink)
+
+    nodes = build_tree_labels(
+        root,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
+
+    assert [node.label for node in nodes] == [f"link.txt -> {real_file}", "real.txt"]
+    assert calls == [("link.txt", True)]
+
+
+def test_build_tree_marks_unreadable_link_targets(monkeypatch, symlink_file_tree) -> None:
+    root, _ = symlink_file_tree
+
+    def failing_readlink(path, *args, **kwargs):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(cli_module.os, "readlink", failing_readlink)
+
+    nodes = build_tree_labels(
+        root,
+        max_files_to_list=5,
+        max_dirs_to_list=5,
+        show_all=False,
+    )
 
-    link_branch = next(child for child in tree.children if _label_text(child).startswith("link"))
-    assert _label_text(link_branch).startswith(f"link -> {real_dir}")
-    assert "inner.txt" in _labels(link_branch)
+    assert nodes[0].segments == [("link.txt", "file"), (" -> ", ""), ("?", "error")]